@@ -0,0 +1,193 @@
+import os, re, hashlib
+from collections import deque
+from typing import Callable, Iterable
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+CRAWLABLE_SCHEMES = ("http", "https")
+
+# "mailto:", "javascript:" etc.; a digit after the colon is a port ("host:8080")
+_scheme_re = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:(?!\d)")
+
+
+def normalise_url(url:str, prefix:str="https://") -> str:
+    url = url.strip()
+    if not "://" in url and not _scheme_re.match(url):
+        url = prefix + url
+    scheme, netloc, path, query, _ = urlsplit(url)
+    # only the host is case-insensitive, userinfo keeps its case
+    userinfo, at, host = netloc.rpartition("@")
+    return urlunsplit((scheme.lower(), userinfo + at + host.lower(), path or "/", query, ""))
+
+
+class URLFrontier:
+    # State lives in three append-only files, replayed on load:
+    #   seen_file    - fixed-size digest of every URL ever queued or visited
+    #   queue_file   - pending URLs, one normalised URL per line
+    #   visited_file - digests of URLs visited since the queue was last compacted
+    # On load the queue is rewritten to hold only unvisited URLs and the visited
+    # file is emptied; the same compaction runs while crawling once the visited
+    # count outgrows the pending work, so restart cost follows the pending count,
+    # not the crawl history. pop() only dequeues; the caller calls mark_visited()
+    # after a successful fetch, so a crash at any point re-queues unfinished URLs.
+    digest_size = 16
+    chunk_records = 65536
+    compact_after = 10000
+
+    def __init__(self, seen_file:str=None, queue_file:str=None, visited_file:str=None, prefix:str="https://") -> None:
+        self.seen_file = seen_file
+        self.queue_file = queue_file
+        self.visited_file = visited_file
+        self.prefix = prefix
+        # digests of every queued or visited URL, constant size per entry
+        self.seen:set[bytes] = set()
+        self.pending:deque[str] = deque()
+        # popped but not yet visited, kept in the queue file by compaction
+        self.in_flight:dict[str, None] = {}
+        self._visited_since_compact = 0
+        self._seen_log = None
+        self._queue_log = None
+        self._visited_log = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def __contains__(self, url:str) -> bool:
+        return self.fingerprint(self.normalise(url)) in self.seen
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def normalise(self, url:str) -> str:
+        return normalise_url(url, self.prefix)
+
+    def fingerprint(self, url:str) -> bytes:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=self.digest_size).digest()
+
+    def add(self, url:str) -> bool:
+        return self.extend((url,)) == 1
+
+    def extend(self, urls:Iterable[str]) -> int:
+        added, digests = [], []
+        for url in urls:
+            url = self.normalise(url)
+            parts = urlsplit(url)
+            if not parts.scheme in CRAWLABLE_SCHEMES or not parts.hostname:
+                continue
+            digest = self.fingerprint(url)
+            if digest in self.seen:
+                continue
+            self.seen.add(digest)
+            self.pending.append(url)
+            added.append(url)
+            digests.append(digest)
+        if added:
+            # the queue is written first; load() restores digests missing from
+            # the seen file for URLs that made it into the queue
+            self._append(self.queue_file, "_queue_log", "".join(url + "\n" for url in added).encode("utf-8"))
+            self._append(self.seen_file, "_seen_log", b"".join(digests))
+        return len(added)
+
+    def pop(self) -> str|None:
+        if not self.pending:
+            return None
+        url = self.pending.popleft()
+        self.in_flight[url] = None
+        return url
+
+    def mark_visited(self, url:str) -> None:
+        url = self.normalise(url)
+        digest = self.fingerprint(url)
+        self.in_flight.pop(url, None)
+        if not digest in self.seen:
+            self.seen.add(digest)
+            self._append(self.seen_file, "_seen_log", digest)
+        if not self.visited_file:
+            return
+        self._append(self.visited_file, "_visited_log", digest)
+        self._visited_since_compact += 1
+        if self.queue_file and self._visited_since_compact > max(len(self.pending), self.compact_after):
+            self._compact()
+
+    def crawl(self, handler:Callable[[str], Iterable[str]|None]) -> None:
+        # handler fetches a page and returns the links found on it; the URL is
+        # marked visited only after its links are queued, so an interrupted
+        # crawl resumes from the frontier files on the next start
+        while url := self.pop():
+            links = handler(url)
+            if links:
+                self.extend(urljoin(url, link) for link in links)
+            self.mark_visited(url)
+
+    def load(self) -> None:
+        self.seen = self._read_digests(self.seen_file)
+        visited = self._read_digests(self.visited_file)
+        if not self.queue_file or not os.path.exists(self.queue_file):
+            return
+        missing = []
+        with open(self.queue_file, "rb") as file:
+            for line in file:
+                # a line without a newline is a torn write and is dropped
+                if not line.endswith(b"\n"):
+                    break
+                url = line[:-1].decode("utf-8")
+                digest = self.fingerprint(url)
+                if digest in visited:
+                    continue
+                if not digest in self.seen:
+                    self.seen.add(digest)
+                    missing.append(digest)
+                self.pending.append(url)
+        if missing:
+            self._append(self.seen_file, "_seen_log", b"".join(missing))
+        self._compact()
+
+    def _compact(self) -> None:
+        for attr in ("_queue_log", "_visited_log"):
+            log = getattr(self, attr)
+            if log is not None:
+                log.close()
+            setattr(self, attr, None)
+        tmp = self.queue_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            file.writelines(url + "\n" for url in self.in_flight)
+            file.writelines(url + "\n" for url in self.pending)
+        os.replace(tmp, self.queue_file)
+        if self.visited_file and os.path.exists(self.visited_file):
+            os.truncate(self.visited_file, 0)
+        self._visited_since_compact = 0
+
+    def _read_digests(self, filename:str) -> set[bytes]:
+        digests = set()
+        if not filename or not os.path.exists(filename):
+            return digests
+        size = self.digest_size
+        with open(filename, "rb") as file:
+            while chunk := file.read(size * self.chunk_records):
+                for i in range(0, len(chunk) - len(chunk) % size, size):
+                    digests.add(chunk[i:i + size])
+        # drop a torn trailing record so that later appends stay aligned
+        length = os.path.getsize(filename)
+        if length % size:
+            os.truncate(filename, length - length % size)
+        return digests
+
+    def _append(self, filename:str, attr:str, data:bytes) -> None:
+        if not filename:
+            return
+        log = getattr(self, attr)
+        if log is None:
+            log = open(filename, "ab")
+            setattr(self, attr, log)
+        log.write(data)
+        log.flush()
+
+    def close(self) -> None:
+        for attr in ("_seen_log", "_queue_log", "_visited_log"):
+            log = getattr(self, attr)
+            if log is not None:
+                log.close()
+            setattr(self, attr, None)
@@ -9,7 +9,10 @@ from decorators import repeat_if_fail
                  ConnectionAbortedError), 7)
 def run_bot():
     tradingview = TradingViewParser()
-    tradingview.parsing_suit()
+    try:
+        tradingview.parsing_suit()
+    finally:
+        tradingview.close()
 
 @click.group()
 def cli():
@@ -9,6 +9,7 @@ from selenium.webdriver.chrome.options import Options
 from typing import Callable, Iterable
 from webdriver_manager.chrome import ChromeDriverManager
 from decorators import repeat_if_fail
+from frontier import URLFrontier, normalise_url
 
 
 
@@ -22,7 +23,6 @@ class Parser:
     prefixes = {HTTPS: "https://",
                 HTTP: "http://"}
     headers = {}
-    cache = []
     date_format = "%d-%m-%Y_%H:%M:%S"
     current_page = None
     base_url = "https://www.example.com"
@@ -40,6 +40,12 @@ class Parser:
         self.db_manager = db_manager
         self.data_file = f"{self.source_name}_data.json"
         self.urls_file = f"{self.source_name}_urls.json"
+        self.seen_file = f"{self.source_name}_seen.bin"
+        self.queue_file = f"{self.source_name}_queue.txt"
+        self.visited_file = f"{self.source_name}_visited.bin"
+        self.cache = []
+        self.urls = []
+        self.frontier:URLFrontier = None
         self.username = os.getenv(self.source_name.upper().replace(" ", "_") + "_USERNAME") or None
         self.password = os.getenv(self.source_name.upper().replace(" ", "_") + "_PASSWORD") or None
         self.proxies = proxies
@@ -94,8 +100,7 @@ class Parser:
     def append_to_file(self, filename, data:Iterable[str]|str):
         with open(filename, 'a') as file:
             if isinstance(data, (tuple, set, list)):
-                for url in data:
-                    file.write(url + '\n')
+                file.writelines(url + '\n' for url in data)
             else: file.write(data + '\n')
         
     def add_prefix(self, url:str, mode:str) -> str:
@@ -104,21 +109,38 @@ class Parser:
         return url
     
     def remove_double_urls(self):
-        data = []
-        for url in self.urls:
-            if not url in data:
-                data.append(url)
-        self.urls = data
+        self.urls = list(dict.fromkeys(self.urls))
     
-    def urls_normalisation(self) -> None:
-        urls = [self.add_prefix(url) for url in self.urls]
-        self.urls = urls
+    def urls_normalisation(self, mode:str=HTTPS) -> None:
+        self.urls = [normalise_url(url, self.prefixes[mode]) for url in self.urls]
 
     def urls_normalisation_file(self, filepath:str, mode) -> None:
         with open(filepath, 'r') as file:
             urls = json.load(file)
-        checked_urls = [self.add_prefix(url, mode) for url in urls]
-        self.write_to_file(f'normalised_{self.source_name}_data.json', checked_urls)
+        checked_urls = [normalise_url(url, self.prefixes[mode]) for url in urls]
+        self.write_to_file(checked_urls, f'normalised_{self.source_name}_data.json')
+
+    def get_frontier(self) -> URLFrontier:
+        # created on first use so that parsers which never crawl don't touch the state files
+        if self.frontier is None:
+            self.frontier = URLFrontier(self.seen_file, self.queue_file, self.visited_file, self.prefixes[HTTPS])
+        return self.frontier
+
+    def collect_urls(self, urls:Iterable[str]=None) -> int:
+        return self.get_frontier().extend(self.urls if urls is None else urls)
+
+    def crawl(self, handler:Callable[[str], Iterable[str]|None]) -> None:
+        self.get_frontier().crawl(handler)
+
+    def close(self):
+        if self.frontier is not None:
+            self.frontier.close()
+        if hasattr(self, "session"):
+            self.session.close()
+            del self.session
+        if hasattr(self, "driver"):
+            self.driver.quit()
+            del self.driver
     
     def combine_cookies(self):
         cookies = '; '.join(['%s=%s'%(key,value) for key,value in self.session.cookies.get_dict().items()]) 